@@ -1,7 +1,10 @@
 import requests
+from requests.adapters import HTTPAdapter
 import os
+import fcntl
 import shutil
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # Set up logging
 logging.basicConfig(
@@ -11,10 +14,29 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(message)s",
 )
 
+# Number of URLs probed concurrently; the checks are bound by network latency
+MAX_WORKERS = 32
+
+# Comment lines and regex filters are not URLs and are never probed
+SKIP_PREFIXES = ("#", "/")
+
+# ioctl request to reflink a file on copy-on-write filesystems (btrfs, xfs)
+FICLONE = 0x40049409
+
+# Shared session so probes reuse pooled keep-alive connections
+SESSION = requests.Session()
+adapter = HTTPAdapter(pool_connections=64, pool_maxsize=MAX_WORKERS)
+SESSION.mount("http://", adapter)
+SESSION.mount("https://", adapter)
+
 
 def check_url(url):
     try:
-        response = requests.head(url, timeout=5, allow_redirects=True)
+        response = SESSION.head(url, timeout=5, allow_redirects=True)
+        if response.status_code == 405:
+            # Some servers reject HEAD; retry with a GET without reading the body
+            response = SESSION.get(url, stream=True, timeout=5, allow_redirects=True)
+            response.close()
         if response.status_code < 400:
             print(f"URL resolves: {url} - Status code: {response.status_code}")
             return True
@@ -35,35 +57,63 @@ def process_file(file_path, output_dir):
     os.makedirs(output_dir, exist_ok=True)
     output_file_path = os.path.join(output_dir, os.path.basename(file_path))
 
+    entries = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped and not stripped.startswith(SKIP_PREFIXES):
+            entries.append((line, stripped))
+    urls = [
+        stripped if stripped.startswith("http") else f"http://{stripped}"
+        for _, stripped in entries
+    ]
+
+    # Probe each distinct URL only once, even if it is listed several times
+    unique_urls = list(dict.fromkeys(urls))
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = dict(zip(unique_urls, executor.map(check_url, unique_urls)))
+
+    written = set()
+    cleaned_lines = []
+    for (line, stripped), url in zip(entries, urls):
+        # Keep only the first occurrence of a duplicated entry
+        if results[url] and stripped not in written:
+            written.add(stripped)
+            cleaned_lines.append(line)
+
     with open(output_file_path, "w") as file:
-        for line in lines:
-            if (
-                line.strip()
-                and not line.strip().startswith("#")
-                and not line.strip().startswith("/")
-            ):
-                url = (
-                    f"http://{line.strip()}"
-                    if not line.strip().startswith("http")
-                    else line.strip()
-                )
-                if check_url(url):
-                    file.write(line)
+        file.write("".join(cleaned_lines))
 
 
 def process_all_files(folder, output_folder):
-    for filename in os.listdir(folder):
-        if filename.endswith(".txt"):
-            process_file(os.path.join(folder, filename), output_folder)
+    file_paths = [
+        os.path.join(folder, filename)
+        for filename in os.listdir(folder)
+        if filename.endswith(".txt")
+    ]
+    with ThreadPoolExecutor(max_workers=len(file_paths) or 1) as executor:
+        list(executor.map(lambda path: process_file(path, output_folder), file_paths))
+
+
+def copy_file(source_file, backup_file):
+    # Try a reflink first so the copy is a metadata-only operation; otherwise
+    # fall back to copy2, which already copies in-kernel via sendfile on Linux.
+    try:
+        with open(source_file, "rb") as src, open(backup_file, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        shutil.copy2(source_file, backup_file)
+    else:
+        shutil.copystat(source_file, backup_file)
 
 
 def sync_files(source_dir, backup_dir):
     print(f"Syncing files from {source_dir} to {backup_dir}")
     os.makedirs(backup_dir, exist_ok=True)
-    for file_name in os.listdir(source_dir):
-        source_file = os.path.join(source_dir, file_name)
-        backup_file = os.path.join(backup_dir, file_name)
-        shutil.copy2(source_file, backup_file)
+    file_names = os.listdir(source_dir)
+    source_files = [os.path.join(source_dir, name) for name in file_names]
+    backup_files = [os.path.join(backup_dir, name) for name in file_names]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        list(executor.map(copy_file, source_files, backup_files))
     print("Backup complete.")
 
 